@@ -9,15 +9,21 @@ Basato su un'idea di Erich Friedman <efriedma@stetson.edu>
 
 fullhouse_engine.py: motore del gioco
 fullhouse_problemi.py: lista dei problemi da risolvere
+fullhouse_finali.py: tabella dei finali
+fullhouse_censimento.py: censimento di tutte le scacchiere
 fullhouse.py: interfaccia grafica
 
 """
 
+import threading
 import wx
 from wx.lib.wordwrap import wordwrap
-from fullhouse_engine import Scacchiera, Posizione, Direzione
+from fullhouse_engine import Problema, Posizione, Direzione, Risolvi
 from fullhouse_problemi import Problemi
 
+# Numero massimo di scacchiere di cui si ricorda l'analisi
+MASSIMO_ANALISI = 1000
+
 # Classe che si occupa di disegnare la
 # finestra della schacchiera
 class FullHouseWindow(wx.Window):
@@ -32,8 +38,12 @@ class FullHouseWindow(wx.Window):
         self.Bind(wx.EVT_PAINT, self.OnPaint)
         self.Bind(wx.EVT_LEFT_UP, self.OnLeftClick)
         self.Bind(wx.EVT_RIGHT_UP, self.OnRightClick)
-        self.scacchiera = Problemi[0]
+        self.scacchiera = Problemi[0].Scacchiera()
         self.edit_mode = False
+        # Risultati delle analisi gia` fatte in modalita` edit
+        # e segnale per interrompere l'analisi in corso
+        self.analisi = {}
+        self.interrompi_analisi = None
 
     # Calcola l'area di un riquadro di una posizione
     # tornando il corrispondente wx.Rect
@@ -144,18 +154,87 @@ class FullHouseWindow(wx.Window):
             self.edit_mode = set_edit
         self.menu_edit_item.Check(self.edit_mode)
         self.scacchiera.Reset()
+        if self.edit_mode:
+            self.AvviaAnalisi()
+        else:
+            self.FermaAnalisi()
+            self.GetParent().SetStatusText("")
         self.Refresh()
 
-    # Sceglie il problema corrente
-    def Problema(self, scacchiera):
-        self.scacchiera = scacchiera
+    # Avvia in background l'analisi della scacchiera in modalita`
+    # edit, interrompendo quella eventualmente ancora in corso
+    def AvviaAnalisi(self):
+        self.FermaAnalisi()
+        problema = Problema.DaScacchiera(self.scacchiera)
+        # Si riusa solo il risultato di una scacchiera identica gia`
+        # analizzata (ad esempio dopo aver annullato un cambio). Le
+        # soluzioni della scacchiera precedente non servono: coprono
+        # tutte le sue caselle bianche, quindi non coprono una casella
+        # appena resa bianca e passano su una appena resa nera
+        if problema in self.analisi:
+            self.MostraAnalisi(self.analisi[problema])
+            return
+        if self.scacchiera.Impossibile():
+            self.FineAnalisi(problema, 0, None)
+            return
+        self.interrompi_analisi = threading.Event()
+        self.GetParent().SetStatusText("Analisi in corso...")
+        analisi = threading.Thread(target = self.Analizza,
+                                   args = (problema, self.interrompi_analisi))
+        analisi.daemon = True
+        analisi.start()
+
+    # Interrompe l'analisi in corso
+    def FermaAnalisi(self):
+        if self.interrompi_analisi:
+            self.interrompi_analisi.set()
+            self.interrompi_analisi = None
+
+    # Cerca al piu` due soluzioni: bastano per sapere se il problema
+    # ha una soluzione unica. Usa sempre il motore a processo singolo:
+    # non si possono creare processi da un thread dell'interfaccia
+    def Analizza(self, problema, interrompi):
+        soluzioni = Risolvi(problema, "ricerca", limite = 2, interrompi = interrompi.is_set)
+        if not interrompi.is_set():
+            wx.CallAfter(self.FineAnalisi, problema, len(soluzioni), interrompi)
+
+    # Memorizza e visualizza il risultato di un'analisi
+    # se nel frattempo non ne e` stata avviata un'altra
+    def FineAnalisi(self, problema, numero_soluzioni, interrompi):
+        if interrompi is not self.interrompi_analisi:
+            return
+        self.interrompi_analisi = None
+        if len(self.analisi) >= MASSIMO_ANALISI:
+            self.analisi.clear()
+        self.analisi[problema] = numero_soluzioni
+        if self.edit_mode:
+            self.MostraAnalisi(numero_soluzioni)
+
+    # Visualizza nella barra di stato il risultato di un'analisi
+    def MostraAnalisi(self, numero_soluzioni):
+        if numero_soluzioni == 0:
+            testo = "Nessuna soluzione"
+        elif numero_soluzioni == 1:
+            testo = "Soluzione unica"
+        else:
+            testo = "Piu` di una soluzione"
+        self.GetParent().SetStatusText(testo)
+
+    # Sceglie il problema corrente creando una nuova scacchiera
+    # di gioco, cosi` da non modificare il problema condiviso
+    def Problema(self, problema):
+        self.scacchiera = problema.Scacchiera()
         self.Azzera()
+        if self.edit_mode:
+            self.AvviaAnalisi()
 
     # Risolve da solo il problema
     def Risolve(self):
         self.Azzera()
         self.aiuto = True
-        soluzioni = self.scacchiera.Risolvi()
+        # Usa il motore a processo singolo: non e` sicuro creare processi
+        # dall'interfaccia mentre un thread di analisi puo` essere attivo
+        soluzioni = Risolvi(self.scacchiera, "ricerca")
         if len(soluzioni) > 0:
             if len(soluzioni) > 1:
                 self.Messaggio("Ci sono %d soluzioni!" % len(soluzioni), "Risolvi",
@@ -197,11 +276,8 @@ class FullHouseWindow(wx.Window):
     # in edit_mode, cambia lo stato di una casella
     def Click(self, posizione):
         if self.edit_mode:
-            if posizione in self.scacchiera.posizioni_nere:
-                self.scacchiera.posizioni_nere.remove(posizione)
-            else:
-                self.scacchiera.posizioni_nere.append(posizione)
-            self.scacchiera.Reset()
+            self.scacchiera.Commuta(posizione)
+            self.AvviaAnalisi()
             self.Refresh()
         elif self.scacchiera.Click(posizione):
             self.Refresh()
@@ -0,0 +1,315 @@
+#!/usr/bin/env python
+# -*- coding: Latin-1 -*-
+
+"""
+Full House
+
+Scritto da Marco Beri <mberi@linkgroup.it>
+Basato su un'idea di Erich Friedman <efriedma@stetson.edu>
+
+fullhouse_engine.py: motore del gioco
+fullhouse_problemi.py: lista dei problemi da risolvere
+fullhouse_finali.py: tabella dei finali
+fullhouse_censimento.py: censimento di tutte le scacchiere
+fullhouse.py: interfaccia grafica
+
+"""
+
+# Censimento di tutte le scacchiere di una dimensione con un dato
+# numero di caselle nere, a meno di rotazioni e riflessioni, con il
+# numero di soluzioni di ciascuna.
+#
+# Le scacchiere sono enumerate sempre nello stesso ordine (quello
+# lessicografico delle combinazioni di caselle nere) e ogni frammento
+# ne contiene un intervallo contiguo, cosi` che i frammenti possano
+# essere calcolati in parallelo su piu` processi o su macchine diverse
+# e ciascuno enumeri solo le proprie combinazioni. Ogni frammento scrive un file con
+# una riga per scacchiera e una riga finale di chiusura: se il calcolo
+# viene interrotto, rilanciandolo riprende dall'ultima riga scritta.
+#
+#     python fullhouse_censimento.py 5 3 --frammenti 8 --processi 4
+#     python fullhouse_censimento.py 5 3 --frammenti 8 --frammento 2
+#     python fullhouse_censimento.py 5 3 --frammenti 8 --riepilogo
+#
+# Senza argomenti effettua solo il test.
+
+import argparse
+import itertools
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+from fullhouse_engine import Problema, Posizione, Risolvi
+
+FINE_FRAMMENTO = "FINE"
+
+# Ritorna, per ciascuna delle otto simmetrie del quadrato,
+# la permutazione degli indici x * dimensione + y delle caselle
+def Simmetrie(dimensione):
+    ultima = dimensione - 1
+    trasformazioni = (lambda x, y: (x, y),
+                      lambda x, y: (ultima - y, x),
+                      lambda x, y: (ultima - x, ultima - y),
+                      lambda x, y: (y, ultima - x),
+                      lambda x, y: (ultima - x, y),
+                      lambda x, y: (x, ultima - y),
+                      lambda x, y: (y, x),
+                      lambda x, y: (ultima - y, ultima - x))
+    simmetrie = []
+    for trasformazione in trasformazioni:
+        permutazione = []
+        for casella in range(dimensione * dimensione):
+            x, y = trasformazione(casella // dimensione, casella % dimensione)
+            permutazione.append(x * dimensione + y)
+        simmetrie.append(tuple(permutazione))
+    return simmetrie
+
+# Coefficiente binomiale
+def Binomiale(n, k):
+    if k < 0 or k > n:
+        return 0
+    risultato = 1
+    for i in range(min(k, n - k)):
+        risultato = risultato * (n - i) // (i + 1)
+    return risultato
+
+# Ritorna la combinazione di k tra elementi che occupa la posizione
+# numero nell'ordine lessicografico, senza enumerare le precedenti
+def Combinazione(numero, elementi, k):
+    combinazione = []
+    primo = 0
+    for i in range(k):
+        for elemento in range(primo, elementi):
+            seguenti = Binomiale(elementi - elemento - 1, k - i - 1)
+            if numero < seguenti:
+                combinazione.append(elemento)
+                primo = elemento + 1
+                break
+            numero -= seguenti
+    return combinazione
+
+# Trasforma la combinazione nella seguente in ordine lessicografico
+def Seguente(combinazione, elementi):
+    k = len(combinazione)
+    i = k - 1
+    while i >= 0 and combinazione[i] == elementi - k + i:
+        i -= 1
+    if i < 0:
+        return False
+    combinazione[i] += 1
+    for j in range(i + 1, k):
+        combinazione[j] = combinazione[j - 1] + 1
+    return True
+
+# Ritorna l'intervallo [inizio, fine) dei numeri delle scacchiere di un frammento
+def Intervallo(dimensione, nere, frammento, frammenti):
+    totale = Binomiale(dimensione * dimensione, nere)
+    return totale * frammento // frammenti, totale * (frammento + 1) // frammenti
+
+# Enumera, nell'ordine del censimento, le coppie (numero, caselle nere)
+# delle scacchiere del frammento che sono le minime tra le loro
+# simmetriche, partendo direttamente dalla prima del frammento
+# o, se indicata, da quella numero da_numero
+def Scacchiere(dimensione, nere, frammento = 0, frammenti = 1, da_numero = None):
+    simmetrie = Simmetrie(dimensione)[1:]
+    inizio, fine = Intervallo(dimensione, nere, frammento, frammenti)
+    if da_numero is not None:
+        inizio = max(inizio, da_numero)
+    if inizio >= fine:
+        return
+    combinazione = Combinazione(inizio, dimensione * dimensione, nere)
+    for numero in range(inizio, fine):
+        caselle = tuple(combinazione)
+        for permutazione in simmetrie:
+            if tuple(sorted([permutazione[casella] for casella in caselle])) < caselle:
+                break
+        else:
+            yield numero, caselle
+        Seguente(combinazione, dimensione * dimensione)
+
+# Ritorna il nome del file di un frammento
+def FileFrammento(cartella, dimensione, nere, frammento, frammenti):
+    return os.path.join(cartella, "censimento_%d_%d_%d_di_%d.txt" %
+                        (dimensione, nere, frammento, frammenti))
+
+# Legge le righe complete del file di un frammento, ritornando la
+# lista delle scacchiere (numero, caselle nere, soluzioni), True se il
+# frammento e` stato completato e la lunghezza in byte delle righe complete
+def LeggiFrammento(percorso):
+    scacchiere = []
+    completo = False
+    lunghezza = 0
+    if os.path.exists(percorso):
+        f = open(percorso, "rb")
+        try:
+            for riga in f:
+                riga = riga.decode("ascii")
+                if not riga.endswith("\n"):
+                    break
+                lunghezza += len(riga)
+                if riga.strip() == FINE_FRAMMENTO:
+                    completo = True
+                    break
+                numero, soluzioni, caselle = riga.split()
+                scacchiere.append((int(numero), tuple([int(casella) for casella in caselle.split(",")]),
+                                   int(soluzioni)))
+        finally:
+            f.close()
+    return scacchiere, completo, lunghezza
+
+# Calcola un frammento del censimento riprendendo, se il file esiste
+# gia`, dall'ultima scacchiera scritta. Ritorna il nome del file
+def CalcolaFrammento(dimensione, nere, frammento, frammenti, cartella = ".", motore = "ricerca"):
+    if not 0 <= frammento < frammenti:
+        raise Exception("frammento %d non compreso tra 0 e %d" % (frammento, frammenti - 1))
+    percorso = FileFrammento(cartella, dimensione, nere, frammento, frammenti)
+    scacchiere, completo, lunghezza = LeggiFrammento(percorso)
+    if completo:
+        return percorso
+    # Tiene le righe complete scritte finora, tagliando via solo
+    # un'eventuale riga troncata, e prosegue in coda al file
+    if os.path.exists(percorso):
+        f = open(percorso, "r+b")
+        f.truncate(lunghezza)
+        f.seek(lunghezza)
+    else:
+        f = open(percorso, "wb")
+    try:
+        da_numero = scacchiere and scacchiere[-1][0] + 1 or None
+        for numero, caselle in Scacchiere(dimensione, nere, frammento, frammenti, da_numero):
+            problema = Problema(dimensione, [Posizione(casella // dimensione, casella % dimensione)
+                                             for casella in caselle])
+            soluzioni = Risolvi(problema, motore)
+            f.write(("%d %d %s\n" % (numero, len(soluzioni), ",".join(map(str, caselle)))).encode("ascii"))
+            f.flush()
+        f.write(("%s\n" % FINE_FRAMMENTO).encode("ascii"))
+    finally:
+        f.close()
+    return percorso
+
+def CalcolaFrammentoProcesso(argomenti):
+    return CalcolaFrammento(*argomenti)
+
+# Calcola i frammenti indicati (di default tutti) distribuendoli
+# su piu` processi (di default uno per core)
+def Calcola(dimensione, nere, frammenti = 1, da_calcolare = None, cartella = ".",
+            processi = None, motore = "ricerca"):
+    if da_calcolare is None:
+        da_calcolare = range(frammenti)
+    lavori = [(dimensione, nere, frammento, frammenti, cartella, motore) for frammento in da_calcolare]
+    if processi is None:
+        processi = multiprocessing.cpu_count()
+    if processi <= 1 or len(lavori) <= 1:
+        return [CalcolaFrammentoProcesso(lavoro) for lavoro in lavori]
+    pool = multiprocessing.Pool(processi)
+    try:
+        return pool.map(CalcolaFrammentoProcesso, lavori)
+    finally:
+        pool.close()
+        pool.join()
+
+# Riunisce i file di tutti i frammenti e ritorna un dizionario con il
+# numero di scacchiere, di quelle risolvibili e di quelle con soluzione
+# unica, il massimo numero di soluzioni e la distribuzione del numero
+# di soluzioni. Solleva un'eccezione se un frammento non e` completo
+def Riepilogo(dimensione, nere, frammenti = 1, cartella = "."):
+    distribuzione = {}
+    for frammento in range(frammenti):
+        percorso = FileFrammento(cartella, dimensione, nere, frammento, frammenti)
+        scacchiere, completo, lunghezza = LeggiFrammento(percorso)
+        if not completo:
+            raise Exception("frammento incompleto %s" % percorso)
+        for numero, caselle, soluzioni in scacchiere:
+            distribuzione[soluzioni] = distribuzione.get(soluzioni, 0) + 1
+    return {"dimensione": dimensione,
+            "nere": nere,
+            "scacchiere": sum(distribuzione.values()),
+            "risolvibili": sum([conteggio for soluzioni, conteggio in distribuzione.items() if soluzioni > 0]),
+            "uniche": distribuzione.get(1, 0),
+            "massimo": max(distribuzione or [0]),
+            "distribuzione": distribuzione}
+
+# Funzione di test
+def Test():
+    cartella = tempfile.mkdtemp()
+    try:
+        # Le scacchiere 3x3 con una casella nera a meno di simmetrie
+        # sono tre: nera nell'angolo, sul lato o al centro
+        assert [caselle for numero, caselle in Scacchiere(3, 1)] == [(0,), (1,), (4,)]
+
+        # I frammenti sono intervalli contigui che, uniti, danno
+        # l'enumerazione completa, e ciascuno parte dalla propria
+        # prima combinazione
+        combinazioni = list(itertools.combinations(range(16), 3))
+        for numero in (0, 1, 17, len(combinazioni) - 1):
+            assert tuple(Combinazione(numero, 16, 3)) == combinazioni[numero]
+        tutte = list(Scacchiere(4, 3))
+        assert [scacchiera for frammento in range(7)
+                for scacchiera in Scacchiere(4, 3, frammento, 7)] == tutte
+        assert list(Scacchiere(4, 3, 0, 1, tutte[5][0])) == tutte[5:]
+
+        # Il motore parallelo puo` essere usato anche da piu` processi
+        Calcola(3, 1, frammenti = 2, cartella = cartella, processi = 2, motore = "parallelo")
+        for frammento in range(2):
+            os.remove(FileFrammento(cartella, 3, 1, frammento, 2))
+        Calcola(3, 1, frammenti = 2, cartella = cartella, processi = 1)
+        riepilogo = Riepilogo(3, 1, frammenti = 2, cartella = cartella)
+        assert riepilogo["scacchiere"] == 3
+        totale = sum([len(Risolvi(Problema(3, [Posizione(casella // 3, casella % 3)])))
+                      for casella in (0, 1, 4)])
+        assert sum([soluzioni * conteggio for soluzioni, conteggio
+                    in riepilogo["distribuzione"].items()]) == totale
+
+        # Un frammento interrotto riprende dall'ultima riga completa
+        percorso = FileFrammento(cartella, 3, 1, 0, 2)
+        righe = open(percorso).readlines()
+        open(percorso, "w").write(righe[0] + righe[1][:2])
+        CalcolaFrammento(3, 1, 0, 2, cartella)
+        assert open(percorso).readlines() == righe
+
+        # Un frammento fuori dall'intervallo viene rifiutato
+        try:
+            CalcolaFrammento(3, 1, 2, 2, cartella)
+            assert False
+        except Exception as errore:
+            assert "frammento" in str(errore)
+    finally:
+        shutil.rmtree(cartella)
+
+# Se eseguito come script, calcola i frammenti o il riepilogo
+# oppure, senza argomenti, effettua solo il test
+if __name__ == "__main__" and len(sys.argv) == 1:
+    Test()
+elif __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = "Censimento delle scacchiere di Full House")
+    parser.add_argument("dimensione", type = int)
+    parser.add_argument("nere", type = int)
+    parser.add_argument("--frammenti", type = int, default = 1,
+                        help = "numero totale di frammenti")
+    parser.add_argument("--frammento", type = int, action = "append",
+                        help = "frammento da calcolare (ripetibile, di default tutti)")
+    parser.add_argument("--processi", type = int,
+                        help = "processi da usare (di default uno per core)")
+    parser.add_argument("--cartella", default = ".",
+                        help = "cartella dei file dei frammenti")
+    parser.add_argument("--motore", default = "ricerca",
+                        help = "motore di risoluzione")
+    parser.add_argument("--riepilogo", action = "store_true",
+                        help = "riunisce i frammenti e stampa il riepilogo")
+    argomenti = parser.parse_args()
+    for frammento in argomenti.frammento or ():
+        if not 0 <= frammento < argomenti.frammenti:
+            parser.error("il frammento %d non e` compreso tra 0 e %d" % (frammento, argomenti.frammenti - 1))
+    if argomenti.riepilogo:
+        riepilogo = Riepilogo(argomenti.dimensione, argomenti.nere,
+                              argomenti.frammenti, argomenti.cartella)
+        print("Scacchiere %(dimensione)dx%(dimensione)d con %(nere)d caselle nere: %(scacchiere)d" % riepilogo)
+        print("Risolvibili: %(risolvibili)d" % riepilogo)
+        print("Con soluzione unica: %(uniche)d" % riepilogo)
+        print("Massimo numero di soluzioni: %(massimo)d" % riepilogo)
+        for soluzioni in sorted(riepilogo["distribuzione"]):
+            print("%6d soluzioni: %d" % (soluzioni, riepilogo["distribuzione"][soluzioni]))
+    else:
+        Calcola(argomenti.dimensione, argomenti.nere, argomenti.frammenti,
+                argomenti.frammento, argomenti.cartella, argomenti.processi, argomenti.motore)
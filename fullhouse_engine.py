@@ -9,10 +9,16 @@ Basato su un'idea di Erich Friedman <efriedma@stetson.edu>
 
 fullhouse_engine.py: motore del gioco
 fullhouse_problemi.py: lista dei problemi da risolvere
+fullhouse_finali.py: tabella dei finali
+fullhouse_censimento.py: censimento di tutte le scacchiere
 fullhouse.py: interfaccia grafica
 
 """
 
+import multiprocessing
+import os
+import fullhouse_finali
+
 # Caselle
 CASELLA_BIANCA = 0
 CASELLA_NERA = 1
@@ -28,6 +34,10 @@ class Direzione:
     def __eq__(self, direzione):
         return self.d_x == direzione.d_x and self.d_y == direzione.d_y
 
+    # Direzioni uguali hanno lo stesso hash
+    def __hash__(self):
+        return hash((self.d_x, self.d_y))
+
     # Ritorna la direzione opposta
     def Opposta(self):
         if self == NORD:
@@ -70,6 +80,10 @@ class Posizione:
     # Due posizioni con uguali coordinate sono uguali
     def __eq__(self, posizione):
         return self.x == posizione.x and self.y == posizione.y
+
+    # Posizioni uguali hanno lo stesso hash
+    def __hash__(self):
+        return hash((self.x, self.y))
     
     # Rappresentazione comprensibile della posizione
     def __repr__(self):
@@ -104,18 +118,50 @@ class Posizione:
 class Scacchiera:
     def __init__(self, dimensione, posizioni_nere = ()):
         self.dimensione = dimensione
-        self.posizioni_nere = list(posizioni_nere)
+        # Le caselle nere sono tenute anche in un insieme
+        # per controllare rapidamente se una casella e` nera
+        self.posizioni_nere = []
+        self.insieme_nere = set()
+        for posizione in posizioni_nere:
+            if posizione not in self.insieme_nere:
+                self.posizioni_nere.append(posizione)
+                self.insieme_nere.add(posizione)
         self.Reset()
 
-    # Crea la scacchiera e azzera le mosse
+    # Crea la scacchiera e azzera le mosse.
+    # Oltre alla matrice, per ogni riga e colonna tiene un indice delle
+    # caselle che bloccano una scivolata: un intero in cui il bit
+    # i + 1 e` acceso se la casella i e` nera o occupata, e i bit 0 e
+    # dimensione + 1 rappresentano i bordi. Tiene inoltre il conto
+    # delle caselle bianche rimaste.
     def Reset(self):
         self.posizioni = []
         self.direzioni = []
         self.matrice = []
+        bordi = 1 | (1 << (self.dimensione + 1))
+        self.righe = [bordi] * self.dimensione
+        self.colonne = [bordi] * self.dimensione
+        self.bianche = self.dimensione * self.dimensione
         for x in range(self.dimensione):
             self.matrice.append([ CASELLA_BIANCA ] * self.dimensione)
         for posizione in self.posizioni_nere:
-            self.matrice[posizione.x][posizione.y] = CASELLA_NERA
+            self.Blocca(posizione, CASELLA_NERA)
+
+    # Rende nera una casella bianca o viceversa, aggiornando solo la
+    # casella interessata. Se ci sono mosse fatte (ad esempio dopo aver
+    # visualizzato la soluzione) la scacchiera viene prima azzerata,
+    # cosi` che nessuna casella resti occupata
+    def Commuta(self, posizione):
+        if self.posizioni:
+            self.Reset()
+        if posizione in self.insieme_nere:
+            self.insieme_nere.remove(posizione)
+            self.posizioni_nere.remove(posizione)
+            self.Sblocca(posizione)
+        else:
+            self.insieme_nere.add(posizione)
+            self.posizioni_nere.append(posizione)
+            self.Blocca(posizione, CASELLA_NERA)
 
     # Rappresentazione comprensibile della Scacchiera
     def __repr__(self):
@@ -145,22 +191,124 @@ class Scacchiera:
             return False
         return True
 
+    # Rende nera o occupata una casella bianca
+    def Blocca(self, posizione, casella):
+        if self.matrice[posizione.x][posizione.y] != CASELLA_BIANCA:
+            return
+        self.matrice[posizione.x][posizione.y] = casella
+        self.righe[posizione.y] |= 1 << (posizione.x + 1)
+        self.colonne[posizione.x] |= 1 << (posizione.y + 1)
+        self.bianche -= 1
+
+    # Rende bianca una casella nera o occupata
+    def Sblocca(self, posizione):
+        if self.matrice[posizione.x][posizione.y] == CASELLA_BIANCA:
+            return
+        self.matrice[posizione.x][posizione.y] = CASELLA_BIANCA
+        self.righe[posizione.y] &= ~(1 << (posizione.x + 1))
+        self.colonne[posizione.x] &= ~(1 << (posizione.y + 1))
+        self.bianche += 1
+
     # Occupa la casella della posizione passata
     def Occupa(self, posizione):
-        self.matrice[posizione.x][posizione.y] = CASELLA_OCCUPATA
+        self.Blocca(posizione, CASELLA_OCCUPATA)
 
     # Libera la casella della posizione passata
     def Libera(self, posizione):
-        self.matrice[posizione.x][posizione.y] = CASELLA_BIANCA
+        self.Sblocca(posizione)
+
+    # Ritorna quante caselle bianche si possono percorrere dalla
+    # posizione nella direzione data, cercando nell'indice della riga
+    # o della colonna la prima casella che blocca la scivolata
+    def Scivolata(self, posizione, direzione):
+        if direzione.d_x:
+            indice, coordinata = self.righe[posizione.y], posizione.x
+        else:
+            indice, coordinata = self.colonne[posizione.x], posizione.y
+        if direzione.d_x + direzione.d_y > 0:
+            seguenti = indice >> (coordinata + 2)
+            return (seguenti & -seguenti).bit_length() - 1
+        precedenti = indice & ((1 << (coordinata + 1)) - 1)
+        return coordinata + 1 - precedenti.bit_length()
+
+    # Occupa (o libera) in una volta sola le caselle che si
+    # percorrono dalla posizione nella direzione data
+    def OccupaTratto(self, posizione, direzione, caselle, casella = CASELLA_OCCUPATA):
+        tratto = (1 << caselle) - 1
+        if direzione.d_x:
+            inizio = min(posizione.x + direzione.d_x, posizione.x + direzione.d_x * caselle)
+            bit = 1 << (posizione.y + 1)
+            if casella == CASELLA_BIANCA:
+                self.righe[posizione.y] &= ~(tratto << (inizio + 1))
+                for x in range(inizio, inizio + caselle):
+                    self.colonne[x] &= ~bit
+            else:
+                self.righe[posizione.y] |= tratto << (inizio + 1)
+                for x in range(inizio, inizio + caselle):
+                    self.colonne[x] |= bit
+            for x in range(inizio, inizio + caselle):
+                self.matrice[x][posizione.y] = casella
+        else:
+            inizio = min(posizione.y + direzione.d_y, posizione.y + direzione.d_y * caselle)
+            bit = 1 << (posizione.x + 1)
+            if casella == CASELLA_BIANCA:
+                self.colonne[posizione.x] &= ~(tratto << (inizio + 1))
+                for y in range(inizio, inizio + caselle):
+                    self.righe[y] &= ~bit
+            else:
+                self.colonne[posizione.x] |= tratto << (inizio + 1)
+                for y in range(inizio, inizio + caselle):
+                    self.righe[y] |= bit
+            self.matrice[posizione.x][inizio:inizio + caselle] = [casella] * caselle
+        if casella == CASELLA_BIANCA:
+            self.bianche += caselle
+        else:
+            self.bianche -= caselle
+
+    # Libera in una volta sola le caselle che si
+    # percorrono dalla posizione nella direzione data
+    def LiberaTratto(self, posizione, direzione, caselle):
+        self.OccupaTratto(posizione, direzione, caselle, CASELLA_BIANCA)
 
     # Controlla se la matrice e` completa e quindi risolta
     def Risolta(self):
-        for x in range(self.dimensione):
-            for y in range(self.dimensione):
-                if self.Percorribile(Posizione(x, y)):
-                    return False
-        return True
+        return self.bianche == 0
         
+    # Controlla in modo rapido, senza esplorare, se il problema
+    # e` sicuramente impossibile: le caselle bianche devono essere
+    # tutte collegate e al piu` due (l'inizio e la fine del percorso)
+    # possono avere una sola casella bianca vicina. Il controllo
+    # considera solo le caselle nere, non le mosse gia` fatte
+    def Impossibile(self):
+        bianche = [Posizione(x, y)
+                   for x in range(self.dimensione)
+                   for y in range(self.dimensione)
+                   if Posizione(x, y) not in self.insieme_nere]
+        if len(bianche) == 0:
+            return True
+        insieme_bianche = set(bianche)
+        estremi = 0
+        for posizione in bianche:
+            vicine = 0
+            for direzione in DIREZIONI:
+                if posizione.Contigua(direzione) in insieme_bianche:
+                    vicine += 1
+            if vicine < 2:
+                estremi += 1
+        if estremi > 2:
+            return True
+        # Visita le caselle bianche a partire dalla prima
+        visitate = set([bianche[0]])
+        da_visitare = [bianche[0]]
+        while da_visitare:
+            posizione = da_visitare.pop()
+            for direzione in DIREZIONI:
+                contigua = posizione.Contigua(direzione)
+                if contigua not in visitate and contigua in insieme_bianche:
+                    visitate.add(contigua)
+                    da_visitare.append(contigua)
+        return len(visitate) < len(bianche)
+
     # Controlla se si e` un punto morto
     def PuntoMorto(self):
         for direzione in DIREZIONI:
@@ -172,20 +320,16 @@ class Scacchiera:
     # Se percorribile ritorna il numero di caselle percorse,
     # altrimenti ritorna 0
     def Percorri(self, direzione):
-        caselle_percorse = 0
         posizione_corrente = self.posizioni[-1]
-        while True:
-            posizione_seguente = posizione_corrente.Contigua(direzione)
-            if not self.Percorribile(posizione_seguente):
-                # Se ho percorso almeno una casella
-                # salvo la direzione e la posizione attuale
-                if caselle_percorse > 0:
-                    self.direzioni.append(direzione)
-                    self.posizioni.append(posizione_corrente)
-                return caselle_percorse
-            caselle_percorse += 1
-            posizione_corrente = posizione_seguente
-            self.Occupa(posizione_corrente)
+        caselle_percorse = self.Scivolata(posizione_corrente, direzione)
+        # Se posso percorrere almeno una casella le occupo
+        # e salvo la direzione e la posizione finale
+        if caselle_percorse > 0:
+            self.OccupaTratto(posizione_corrente, direzione, caselle_percorse)
+            self.direzioni.append(direzione)
+            self.posizioni.append(Posizione(posizione_corrente.x + direzione.d_x * caselle_percorse,
+                                            posizione_corrente.y + direzione.d_y * caselle_percorse))
+        return caselle_percorse
 
     # "Clicca" una casella. Se possibile, questo causa
     # il movimento nella direzione prescelta dalla casella.
@@ -210,14 +354,12 @@ class Scacchiera:
     # Annulla l'ultima mossa fatta
     def Annulla(self):
         if len(self.direzioni) > 0:
-            direzione = self.direzioni.pop().Opposta()
-            posizione_corrente = self.posizioni.pop()
-            while True:
-                self.Libera(posizione_corrente)
-                posizione_seguente = posizione_corrente.Contigua(direzione)
-                if posizione_seguente == self.posizioni[-1]:
-                    break
-                posizione_corrente = posizione_seguente
+            direzione = self.direzioni.pop()
+            posizione_finale = self.posizioni.pop()
+            posizione_iniziale = self.posizioni[-1]
+            caselle_percorse = abs(posizione_finale.x - posizione_iniziale.x) + \
+                               abs(posizione_finale.y - posizione_iniziale.y)
+            self.LiberaTratto(posizione_iniziale, direzione, caselle_percorse)
             return True
         elif len(self.posizioni) > 0:
             self.Libera(self.posizioni.pop())
@@ -230,16 +372,32 @@ class Scacchiera:
             self.soluzioni.append((self.posizioni[0],) + tuple(self.direzioni[:]))
             return
         for direzione in DIREZIONI:
+            if self.Fermata():
+                return
             if self.Click(self.posizioni[-1].Contigua(direzione)):
                 self.Esplora()
                 self.Annulla()
 
-    # Risolve il problema
-    def Risolvi(self):
+    # Controlla se la ricerca deve essere fermata perche` si e`
+    # raggiunto il limite di soluzioni o e` stata interrotta
+    def Fermata(self):
+        if self.limite and len(self.soluzioni) >= self.limite:
+            return True
+        return self.interrompi is not None and self.interrompi()
+
+    # Risolve il problema. Se indicato un limite, si ferma dopo
+    # averne trovato altrettante soluzioni; se indicata, la funzione
+    # interrompi viene chiamata durante la ricerca e se ritorna
+    # True la ricerca viene abbandonata
+    def Risolvi(self, limite = None, interrompi = None):
         self.Reset()
         self.soluzioni = []
+        self.limite = limite
+        self.interrompi = interrompi
         for x in range(self.dimensione):
             for y in range(self.dimensione):
+                if self.Fermata():
+                    return self.soluzioni
                 #self.posizioni = [Posizione(x, y)]
                 #if self.percorribile(self.posizioni[0]):
                 #    #self.occupa(self.posizioni[0])
@@ -249,6 +407,405 @@ class Scacchiera:
                     self.Annulla()
         return self.soluzioni
 
+# Descrizione immutabile di un problema: la dimensione, le caselle
+# nere e la geometria precalcolata. Le caselle sono indicate da un
+# indice x * dimensione + y e per ogni casella e direzione viene
+# precalcolata la sequenza delle caselle percorribili fino alla prima
+# nera o al bordo. Non essendo mai modificata, la stessa istanza puo`
+# essere usata contemporaneamente da piu` ricerche, thread o processi.
+class Problema(object):
+    __slots__ = ("dimensione", "posizioni_nere", "nere", "bianche", "scivolate")
+
+    def __init__(self, dimensione, posizioni_nere = ()):
+        posizioni_nere = tuple(sorted(set(posizioni_nere),
+                                      key = lambda posizione: (posizione.x, posizione.y)))
+        nere = bytearray(dimensione * dimensione)
+        for posizione in posizioni_nere:
+            nere[posizione.x * dimensione + posizione.y] = 1
+        scivolate = []
+        for x in range(dimensione):
+            for y in range(dimensione):
+                scivolate_casella = []
+                for direzione in DIREZIONI:
+                    caselle = []
+                    x_seguente, y_seguente = x + direzione.d_x, y + direzione.d_y
+                    while 0 <= x_seguente < dimensione and 0 <= y_seguente < dimensione and \
+                              not nere[x_seguente * dimensione + y_seguente]:
+                        caselle.append(x_seguente * dimensione + y_seguente)
+                        x_seguente += direzione.d_x
+                        y_seguente += direzione.d_y
+                    scivolate_casella.append(tuple(caselle))
+                scivolate.append(tuple(scivolate_casella))
+        object.__setattr__(self, "dimensione", dimensione)
+        object.__setattr__(self, "posizioni_nere", posizioni_nere)
+        object.__setattr__(self, "nere", bytes(nere))
+        object.__setattr__(self, "bianche", len(nere) - len(posizioni_nere))
+        object.__setattr__(self, "scivolate", tuple(scivolate))
+
+    # Crea la descrizione del problema di una scacchiera
+    @staticmethod
+    def DaScacchiera(scacchiera):
+        return Problema(scacchiera.dimensione, scacchiera.posizioni_nere)
+
+    # Il problema non e` modificabile
+    def __setattr__(self, nome, valore):
+        raise AttributeError("Problema non modificabile")
+
+    # Due problemi con uguali dimensione e caselle nere sono uguali
+    def __eq__(self, problema):
+        return isinstance(problema, Problema) and \
+               self.dimensione == problema.dimensione and self.nere == problema.nere
+
+    def __ne__(self, problema):
+        return not self == problema
+
+    def __hash__(self):
+        return hash((self.dimensione, self.nere))
+
+    # Per la copia tra processi basta la descrizione:
+    # la geometria viene ricalcolata
+    def __reduce__(self):
+        return (Problema, (self.dimensione, self.posizioni_nere))
+
+    # Rappresentazione comprensibile del problema
+    def __repr__(self):
+        return "<Problema dimensione=%d nere=%s>" % (self.dimensione, list(self.posizioni_nere))
+
+    # Ritorna la Posizione corrispondente all'indice di una casella
+    def Posizione(self, casella):
+        return Posizione(casella // self.dimensione, casella % self.dimensione)
+
+    # Crea una nuova scacchiera di gioco per il problema
+    def Scacchiera(self):
+        return Scacchiera(self.dimensione, self.posizioni_nere)
+
+    # Risolve il problema con una nuova Ricerca che, se e` stata
+    # generata, usa la tabella dei finali
+    def Risolvi(self, limite = None, interrompi = None):
+        return Ricerca(self, fullhouse_finali.Tabella()).Risolvi(limite, interrompi)
+
+# Stato di una singola ricerca delle soluzioni di un Problema:
+# contiene solo le caselle occupate e le mosse fatte, mentre la
+# geometria e` letta dal Problema condiviso. Se e` indicata una
+# tabella dei finali, quando restano poche caselle libere la ricerca
+# vi legge i completamenti invece di esplorarli
+class Ricerca:
+    def __init__(self, problema, finali = None):
+        self.problema = problema
+        self.finali = finali
+        self.occupate = bytearray(problema.nere)
+        self.libere = problema.bianche
+        # Soglia di caselle libere sotto cui si consulta la tabella,
+        # regioni della tabella indicizzate per maschera e maschera
+        # con tutte le caselle occupate (vedi Finali.Maschere)
+        self.soglia = -1
+        if finali:
+            self.soglia = finali.dimensione
+            self.regioni_finali = finali.Maschere(problema.dimensione)
+            self.piene = int.from_bytes(b"\x01" * len(self.occupate), "little")
+        self.inizio = None
+        self.direzioni = []
+        self.soluzioni = []
+        self.limite = None
+        self.interrompi = None
+
+    # Controlla se la ricerca deve essere fermata perche` si e`
+    # raggiunto il limite di soluzioni o e` stata interrotta
+    def Fermata(self):
+        if self.limite and len(self.soluzioni) >= self.limite:
+            return True
+        return self.interrompi is not None and self.interrompi()
+
+    # Esplora ricorsivamente le mosse possibili dalla casella corrente
+    def Esplora(self, corrente):
+        if self.libere == 0:
+            self.soluzioni.append((self.problema.Posizione(self.inizio),) +
+                                  tuple([DIREZIONI[direzione] for direzione in self.direzioni]))
+            return
+        if self.libere <= self.soglia:
+            self.Completa(corrente)
+            return
+        occupate = self.occupate
+        for direzione, caselle in enumerate(self.problema.scivolate[corrente]):
+            if self.Fermata():
+                return
+            percorse = []
+            for casella in caselle:
+                if occupate[casella]:
+                    break
+                occupate[casella] = 1
+                percorse.append(casella)
+            if percorse:
+                self.libere -= len(percorse)
+                self.direzioni.append(direzione)
+                self.Esplora(percorse[-1])
+                self.direzioni.pop()
+                self.libere += len(percorse)
+                for casella in percorse:
+                    occupate[casella] = 0
+
+    # Aggiunge le soluzioni che completano la regione
+    # di caselle libere secondo la tabella dei finali
+    def Completa(self, corrente):
+        regione = self.piene ^ int.from_bytes(self.occupate, "little") | 1 << 8 * corrente
+        spostamento = (regione & -regione).bit_length() - 1
+        prima = spostamento // 8
+        completamenti = self.regioni_finali.get((regione >> spostamento, prima % self.problema.dimensione,
+                                                 corrente - prima))
+        if completamenti:
+            inizio = (self.problema.Posizione(self.inizio),) + \
+                     tuple([DIREZIONI[direzione] for direzione in self.direzioni])
+            for mosse in completamenti:
+                if self.Fermata():
+                    return
+                self.soluzioni.append(inizio + tuple([DIREZIONI[direzione] for direzione in mosse]))
+
+    # Risolve il problema con gli stessi parametri, e ritornando le
+    # soluzioni nello stesso formato e ordine, di Scacchiera.Risolvi.
+    # Se indicate, parte solo dalle caselle iniziali passate
+    def Risolvi(self, limite = None, interrompi = None, inizi = None):
+        self.soluzioni = []
+        self.limite = limite
+        self.interrompi = interrompi
+        if inizi is None:
+            inizi = range(len(self.occupate))
+        for casella in inizi:
+            if self.Fermata():
+                break
+            if not self.occupate[casella]:
+                self.inizio = casella
+                self.occupate[casella] = 1
+                self.libere -= 1
+                self.Esplora(casella)
+                self.libere += 1
+                self.occupate[casella] = 0
+        return self.soluzioni
+
+# Valore di default della soluzione canonica del Verificatore, distinto
+# da None (problema senza soluzioni), per indicare che va calcolata
+CANONICA_DA_CALCOLARE = object()
+
+# Classe per verificare rapidamente le soluzioni proposte per un
+# problema (o una scacchiera) usando le sequenze di caselle
+# precalcolate dal Problema, cosi` che la verifica non debba
+# creare Posizione ne` controllare i bordi.
+class Verificatore:
+    def __init__(self, problema, canonica = CANONICA_DA_CALCOLARE):
+        if not isinstance(problema, Problema):
+            problema = Problema.DaScacchiera(problema)
+        self.problema = problema
+        self.dimensione = problema.dimensione
+        self.nere = problema.nere
+        self.bianche = problema.bianche
+        self.scivolate = problema.scivolate
+        self.codici_direzioni = dict(((direzione.d_x, direzione.d_y), codice)
+                                     for codice, direzione in enumerate(DIREZIONI))
+        # La soluzione canonica, se non indicata, e` la prima trovata da
+        # Risolvi; None indica che il problema non ha soluzioni
+        if canonica is CANONICA_DA_CALCOLARE:
+            canonica = None
+            soluzioni = problema.Risolvi(limite = 1)
+            if soluzioni:
+                canonica = soluzioni[0]
+        self.soluzione_canonica = canonica
+        self.canonica = canonica and self.Codifica(canonica)
+
+    # Trasforma una soluzione nel formato di Risolvi in una tupla di
+    # interi: l'indice della casella iniziale seguito dai codici delle
+    # direzioni. Se la soluzione non e` interpretabile ritorna None
+    def Codifica(self, soluzione):
+        try:
+            inizio = soluzione[0]
+            if not (0 <= inizio.x < self.dimensione and 0 <= inizio.y < self.dimensione):
+                return None
+            codice = [inizio.x * self.dimensione + inizio.y]
+            for direzione in soluzione[1:]:
+                codice.append(self.codici_direzioni[(direzione.d_x, direzione.d_y)])
+        except (AttributeError, IndexError, KeyError, TypeError):
+            return None
+        return tuple(codice)
+
+    # Verifica una soluzione gia` codificata. Ritorna la tupla
+    # (legale, completa, canonica): legale se tutte le mosse sono
+    # possibili, completa se in piu` copre tutte le caselle bianche,
+    # canonica se in piu` coincide con la soluzione canonica. Indici
+    # di casella o codici di direzione fuori intervallo sono illegali
+    def VerificaCodificata(self, codice):
+        if not codice:
+            return (False, False, False)
+        occupate = bytearray(self.nere)
+        corrente = codice[0]
+        if not 0 <= corrente < len(occupate) or occupate[corrente]:
+            return (False, False, False)
+        occupate[corrente] = 1
+        libere = self.bianche - 1
+        scivolate = self.scivolate
+        for direzione in codice[1:]:
+            if not 0 <= direzione < len(DIREZIONI):
+                return (False, False, False)
+            caselle_percorse = 0
+            for casella in scivolate[corrente][direzione]:
+                if occupate[casella]:
+                    break
+                occupate[casella] = 1
+                corrente = casella
+                caselle_percorse += 1
+            if caselle_percorse == 0:
+                return (False, False, False)
+            libere -= caselle_percorse
+        if libere > 0:
+            return (True, False, False)
+        return (True, True, codice == self.canonica)
+
+    # Verifica una soluzione nel formato di Risolvi
+    def Verifica(self, soluzione):
+        return self.VerificaCodificata(self.Codifica(soluzione))
+
+# Verificatore usato da ciascun processo di VerificaLotto
+verificatore_processo = None
+
+def InizializzaProcessoVerifica(problema, canonica):
+    global verificatore_processo
+    verificatore_processo = Verificatore(problema, canonica)
+
+def VerificaBlocco(soluzioni):
+    return [verificatore_processo.Verifica(soluzione) for soluzione in soluzioni]
+
+# Verifica un lotto di soluzioni per lo stesso problema distribuendo
+# il lavoro, codifica compresa, su piu` processi (di default uno per
+# core). La soluzione canonica, se non indicata, viene calcolata una
+# volta sola. Ritorna la lista dei risultati di Verificatore.Verifica
+# nello stesso ordine
+def VerificaLotto(problema, soluzioni, processi = None, blocco = 5000,
+                  canonica = CANONICA_DA_CALCOLARE):
+    verificatore = Verificatore(problema, canonica)
+    if processi is None:
+        processi = multiprocessing.cpu_count()
+    if processi <= 1 or len(soluzioni) <= blocco:
+        return [verificatore.Verifica(soluzione) for soluzione in soluzioni]
+    blocchi = [soluzioni[inizio:inizio + blocco] for inizio in range(0, len(soluzioni), blocco)]
+    pool = multiprocessing.Pool(processi, InizializzaProcessoVerifica,
+                                (verificatore.problema, verificatore.soluzione_canonica))
+    try:
+        risultati = []
+        for risultati_blocco in pool.map(VerificaBlocco, blocchi):
+            risultati.extend(risultati_blocco)
+    finally:
+        pool.close()
+        pool.join()
+    return risultati
+
+# Motori di risoluzione registrati: a ciascun nome corrisponde una
+# funzione che riceve un Problema, il limite di soluzioni e la funzione
+# di interruzione (come Problema.Risolvi) e ritorna la lista delle
+# soluzioni nel formato e nell'ordine di Scacchiera.Risolvi
+MOTORI = {}
+
+# Motore automatico e variabili d'ambiente per scegliere
+# il motore e per confrontarlo con un secondo motore
+MOTORE_AUTOMATICO = "auto"
+VARIABILE_MOTORE = "FULLHOUSE_MOTORE"
+VARIABILE_CONFRONTO = "FULLHOUSE_CONFRONTA"
+
+# Soglie della scelta automatica: il motore parallelo conviene
+# solo se ci sono abbastanza caselle bianche da esplorare
+PARALLELO_BIANCHE_MINIME = 60
+PARALLELO_DENSITA_MASSIMA = 0.2
+
+# Registra un motore di risoluzione
+def RegistraMotore(nome, funzione):
+    MOTORI[nome] = funzione
+
+# Sceglie il motore in base alla dimensione della scacchiera,
+# alla densita` delle caselle nere e ai core disponibili. Una ricerca
+# con un limite di soluzioni e` breve e non usa mai piu` processi
+def ScegliMotore(problema, limite = None):
+    densita = float(len(problema.posizioni_nere)) / (problema.dimensione * problema.dimensione)
+    if not limite and multiprocessing.cpu_count() > 1 and \
+           problema.bianche >= PARALLELO_BIANCHE_MINIME and \
+           densita <= PARALLELO_DENSITA_MASSIMA:
+        return "parallelo"
+    return "ricerca"
+
+# Ritorna la funzione del motore indicato. Se non indicato, usa quello
+# della variabile d'ambiente FULLHOUSE_MOTORE o la scelta automatica
+def Motore(problema, motore = None, limite = None):
+    if motore is None:
+        motore = os.environ.get(VARIABILE_MOTORE, MOTORE_AUTOMATICO)
+    if motore == MOTORE_AUTOMATICO:
+        motore = ScegliMotore(problema, limite)
+    if motore not in MOTORI:
+        raise Exception("motore sconosciuto %s" % motore)
+    return MOTORI[motore]
+
+# Risolve un problema (o una scacchiera) con il motore indicato o
+# scelto automaticamente. Se indicato un motore di confronto (o la
+# variabile d'ambiente FULLHOUSE_CONFRONTA), risolve il problema anche
+# con questo e solleva un'eccezione se le soluzioni sono diverse
+def Risolvi(problema, motore = None, limite = None, interrompi = None, confronta = None):
+    if not isinstance(problema, Problema):
+        problema = Problema.DaScacchiera(problema)
+    soluzioni = Motore(problema, motore, limite)(problema, limite, interrompi)
+    if confronta is None:
+        confronta = os.environ.get(VARIABILE_CONFRONTO)
+    if confronta:
+        soluzioni_confronto = Motore(problema, confronta, limite)(problema, limite, interrompi)
+        if not (interrompi and interrompi()) and \
+               set(soluzioni) != set(soluzioni_confronto):
+            raise Exception("il motore di confronto %s da` soluzioni diverse per %s" %
+                            (confronta, problema))
+    return soluzioni
+
+# Motore che usa la scacchiera di gioco, lento ma di riferimento
+def RisolviScacchiera(problema, limite = None, interrompi = None):
+    return problema.Scacchiera().Risolvi(limite, interrompi)
+
+# Problema risolto da ciascun processo di RisolviParallelo
+problema_processo = None
+
+def InizializzaProcessoRicerca(problema):
+    global problema_processo
+    problema_processo = problema
+
+def RisolviInizio(argomenti):
+    inizio, limite = argomenti
+    return Ricerca(problema_processo, fullhouse_finali.Tabella()).Risolvi(limite, inizi = (inizio,))
+
+# Motore che distribuisce su piu` processi la ricerca, una
+# casella iniziale alla volta, riunendo le soluzioni in ordine.
+# Dentro un processo di un altro pool (che non puo` avere processi
+# figli) risolve nel processo corrente
+def RisolviParallelo(problema, limite = None, interrompi = None, processi = None):
+    if processi is None:
+        processi = multiprocessing.cpu_count()
+    if processi <= 1 or multiprocessing.current_process().daemon:
+        return problema.Risolvi(limite, interrompi)
+    nere = bytearray(problema.nere)
+    inizi = [casella for casella in range(len(nere)) if not nere[casella]]
+    soluzioni = []
+    pool = multiprocessing.Pool(processi, InizializzaProcessoRicerca, (problema,))
+    try:
+        risultati = pool.imap(RisolviInizio, [(inizio, limite) for inizio in inizi])
+        for inizio in inizi:
+            while True:
+                if interrompi is not None and interrompi():
+                    return soluzioni
+                try:
+                    soluzioni.extend(risultati.next(0.1))
+                    break
+                except multiprocessing.TimeoutError:
+                    pass
+            if limite and len(soluzioni) >= limite:
+                return soluzioni[:limite]
+    finally:
+        pool.terminate()
+        pool.join()
+    return soluzioni
+
+RegistraMotore("scacchiera", RisolviScacchiera)
+RegistraMotore("ricerca", Problema.Risolvi)
+RegistraMotore("parallelo", RisolviParallelo)
+
 # Funzione di test
 def Test():
     # Gioco di esempio con relativa soluzione
@@ -285,6 +842,120 @@ def Test():
     assert len(soluzioni) == 1
     assert soluzioni[0] == soluzione
 
+    # Verifica l'indice delle caselle che bloccano le scivolate
+    s.Reset()
+    assert s.Click(Posizione(4, 0))
+    assert s.Scivolata(Posizione(4, 0), OVEST) == 4
+    assert s.Scivolata(Posizione(4, 0), SUD) == 0
+    assert s.Scivolata(Posizione(0, 0), SUD) == 1
+    assert s.Scivolata(Posizione(3, 4), NORD) == 0
+    assert s.Scivolata(Posizione(2, 2), EST) == 2
+    assert s.Click(Posizione(0, 0)) and s.Click(Posizione(0, 1))
+    assert s.bianche == 16 and s.matrice[0][1] == CASELLA_OCCUPATA
+    assert s.Scivolata(Posizione(2, 2), NORD) == 1
+    assert s.Annulla() and s.Annulla()
+    assert s.bianche == 21 and s.matrice[0][0] == CASELLA_BIANCA
+    assert s.righe[0] == 1 | (1 << 5) | (1 << 6)
+    assert s.Annulla() and not s.Annulla()
+    assert s.bianche == 22
+
+    # Un cambio di casella dopo aver giocato azzera prima le mosse
+    giocata = Scacchiera(5, (Posizione(0, 3), Posizione(0, 4), Posizione(4, 4)))
+    soluzione_giocata = giocata.Risolvi()[0]
+    assert giocata.Click(soluzione_giocata[0])
+    for direzione in soluzione_giocata[1:]:
+        assert giocata.Click(giocata.posizioni[-1].Contigua(direzione))
+    assert giocata.Risolta()
+    giocata.Commuta(Posizione(0, 2))
+    assert giocata.posizioni == [] and giocata.matrice[0][2] == CASELLA_NERA
+    assert not giocata.Impossibile()
+    assert len(giocata.Risolvi()) == len(Problema.DaScacchiera(giocata).Risolvi()) == 3
+    giocata.Commuta(Posizione(0, 2))
+    assert Posizione(0, 2) not in giocata.insieme_nere
+    assert giocata.matrice[0][2] == CASELLA_BIANCA
+
+    # Una casella nera ripetuta conta una volta sola
+    doppia = Scacchiera(3, [Posizione(0, 0), Posizione(0, 0)])
+    assert doppia.bianche == 8
+    assert len(doppia.Risolvi()) == len(Problema(3, [Posizione(0, 0)]).Risolvi()) == 10
+
+    # Verifica la ricerca limitata e i controlli rapidi
+    assert not s.Impossibile()
+    assert len(Scacchiera(dimensione, posizioni_nere).Risolvi(limite = 1)) == 1
+    assert len(Scacchiera(dimensione).Risolvi(limite = 2)) == 2
+    s.Commuta(Posizione(3, 0))
+    assert s.matrice[3][0] == CASELLA_NERA
+    assert s.Impossibile()
+    s.Commuta(Posizione(3, 0))
+    assert s.matrice[3][0] == CASELLA_BIANCA
+    assert Posizione(3, 0) not in s.posizioni_nere
+
+    # Verifica che il problema immutabile dia le stesse soluzioni
+    p = Problema(dimensione, posizioni_nere)
+    assert p == Problema.DaScacchiera(s)
+    assert hash(p) == hash(Problema(dimensione, reversed(posizioni_nere)))
+    assert p.Risolvi() == soluzioni
+    assert Problema(6).Risolvi() == Scacchiera(6).Risolvi()
+    try:
+        p.dimensione = 6
+        assert False
+    except AttributeError:
+        pass
+
+    # Verifica che tutti i motori diano le stesse soluzioni
+    for motore in sorted(MOTORI):
+        assert Risolvi(p, motore, confronta = "scacchiera") == soluzioni
+    assert Risolvi(s, limite = 1) == soluzioni
+    assert ScegliMotore(Problema(9), limite = 2) == "ricerca"
+
+    # Verifica che la ricerca con la tabella dei finali dia le stesse
+    # soluzioni della ricerca completa, anche su scacchiere piccole dove
+    # le regioni della tabella vanno a capo in modi diversi
+    finali = fullhouse_finali.Tabella()
+    if finali:
+        for problema in (p, Problema(3), Problema(4), Problema(4, (Posizione(0, 3),)), Problema(5),
+                         Problema(5, (Posizione(1, 4), Posizione(3, 0))),
+                         Problema(6, (Posizione(2, 2), Posizione(4, 1)))):
+            assert Ricerca(problema, finali).Risolvi() == Ricerca(problema).Risolvi()
+            assert problema.Risolvi() == RisolviScacchiera(problema)
+        assert Ricerca(Problema(5), finali).Risolvi(limite = 3) == Ricerca(Problema(5)).Risolvi(limite = 3)
+
+    # Verifica il motore parallelo con piu` processi anche su un solo core
+    assert RisolviParallelo(p, processi = 2) == soluzioni
+    assert RisolviParallelo(Problema(4), limite = 3, processi = 2) == Problema(4).Risolvi(limite = 3)
+    assert RisolviParallelo(Problema(5), processi = 2) == Risolvi(Problema(5), "scacchiera")
+    assert RisolviParallelo(Problema(5), interrompi = lambda: True, processi = 2) == []
+
+    # Verifica le soluzioni proposte
+    v = Verificatore(s)
+    assert v.Verifica(soluzione) == (True, True, True)
+    assert v.Verifica(soluzione[:-1]) == (True, False, False)
+    assert v.Verifica(soluzione + (NORD,)) == (False, False, False)
+    assert v.Verifica((Posizione(0, 2), SUD)) == (False, False, False)
+    assert v.Verifica((Posizione(5, 0), SUD)) == (False, False, False)
+    assert v.Verifica(()) == (False, False, False)
+    assert v.VerificaCodificata((25, 0)) == (False, False, False)
+    assert v.VerificaCodificata((-1,)) == (False, False, False)
+    assert v.VerificaCodificata((20, 4)) == (False, False, False)
+    assert v.VerificaCodificata((20, -1)) == (False, False, False)
+    assert VerificaLotto(s, [soluzione, soluzione[:3]] * 3, processi = 2, blocco = 2) == \
+           [(True, True, True), (True, False, False)] * 3
+
+    # Una soluzione canonica indicata, anche None per un problema
+    # senza soluzioni, non viene ricalcolata
+    q = Problema(4)
+    prima, altra = q.Risolvi(limite = 2)
+    assert Verificatore(q).Verifica(prima) == (True, True, True)
+    assert Verificatore(q, altra).Verifica(altra) == (True, True, True)
+    assert Verificatore(q, altra).Verifica(prima) == (True, True, False)
+    assert Verificatore(q, None).Verifica(prima) == (True, True, False)
+    for processi in (1, 2):
+        assert VerificaLotto(q, [prima, altra, (Posizione(9, 9), SUD)] * 2, processi = processi,
+                             blocco = 2, canonica = altra) == \
+               [(True, True, False), (True, True, True), (False, False, False)] * 2
+        assert VerificaLotto(q, [prima] * 3, processi = processi, blocco = 2, canonica = None) == \
+               [(True, True, False)] * 3
+
 # Se eseguito come script, effettua solo il test
 if __name__ == "__main__":
     Test()
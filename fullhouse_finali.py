@@ -0,0 +1,276 @@
+#!/usr/bin/env python
+# -*- coding: Latin-1 -*-
+
+"""
+Full House
+
+Scritto da Marco Beri <mberi@linkgroup.it>
+Basato su un'idea di Erich Friedman <efriedma@stetson.edu>
+
+fullhouse_engine.py: motore del gioco
+fullhouse_problemi.py: lista dei problemi da risolvere
+fullhouse_finali.py: tabella dei finali
+fullhouse_censimento.py: censimento di tutte le scacchiere
+fullhouse.py: interfaccia grafica
+
+"""
+
+# Tabella dei finali: per ogni regione di al piu` DIMENSIONE_FINALI
+# caselle libere, vista dalla casella corrente, contiene tutte le
+# sequenze di mosse che la completano. Poiche` una scivolata si ferma
+# allo stesso modo su una casella nera, occupata o sul bordo, una
+# regione e` descritta solo dalle caselle libere e dalla casella
+# corrente, senza bisogno della direzione di arrivo. Le regioni sono
+# normalizzate per traslazione, rotazione e riflessione e nella tabella
+# ci sono solo quelle completabili: una regione abbastanza piccola che
+# non vi compare non puo` essere completata.
+#
+# La tabella si genera una volta per tutte eseguendo questo modulo:
+#
+#     python fullhouse_finali.py 8
+#
+# e viene caricata dal file solo al primo utilizzo; se il file
+# esiste la usa di default la ricerca di fullhouse_engine. Senza
+# argomenti il modulo effettua solo il test.
+
+import os
+import sys
+import tempfile
+import zlib
+
+DIMENSIONE_FINALI = 8
+FILE_FINALI = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fullhouse_finali.dat")
+INTESTAZIONE = "FULLHOUSE-FINALI"
+
+# Spostamenti delle direzioni, nello stesso ordine
+# di DIREZIONI in fullhouse_engine: NORD, EST, SUD, OVEST
+SPOSTAMENTI = ((0, -1), (1, 0), (0, 1), (-1, 0))
+
+# Le otto simmetrie del quadrato come matrici (a, b, c, d)
+# che trasformano (x, y) in (a * x + b * y, c * x + d * y)
+SIMMETRIE = ((1, 0, 0, 1), (0, -1, 1, 0), (-1, 0, 0, -1), (0, 1, -1, 0),
+             (-1, 0, 0, 1), (1, 0, 0, -1), (0, 1, 1, 0), (0, -1, -1, 0))
+
+# Per ogni simmetria, la direzione trasformata di ciascuna direzione
+DIREZIONI_TRASFORMATE = [tuple([SPOSTAMENTI.index((a * d_x + b * d_y, c * d_x + d * d_y))
+                                for d_x, d_y in SPOSTAMENTI])
+                         for a, b, c, d in SIMMETRIE]
+
+# Codifica una casella (gia` traslata) con due lettere
+def CodificaCasella(casella):
+    return chr(65 + casella[0]) + chr(65 + casella[1])
+
+# Decodifica le caselle di una chiave
+def DecodificaCaselle(chiave):
+    return [(ord(chiave[i]) - 65, ord(chiave[i + 1]) - 65) for i in range(0, len(chiave), 2)]
+
+# Ritorna la chiave, normalizzata solo per traslazione, con cui la
+# tabella in memoria cerca la regione: la casella corrente seguita
+# dalle caselle libere ordinate
+def Traslata(corrente, libere):
+    min_x = min(corrente[0], min([x for x, y in libere]))
+    min_y = min(corrente[1], min([y for x, y in libere]))
+    return ((corrente[0] - min_x, corrente[1] - min_y),) + \
+           tuple(sorted([(x - min_x, y - min_y) for x, y in libere]))
+
+# Ritorna la chiave normalizzata della regione formata dalle caselle
+# libere vista dalla casella corrente e la simmetria che la produce
+def Normalizza(corrente, libere):
+    migliore = None
+    for simmetria, (a, b, c, d) in enumerate(SIMMETRIE):
+        trasformate = [(a * x + b * y, c * x + d * y) for x, y in libere]
+        x, y = corrente
+        corrente_trasformata = (a * x + b * y, c * x + d * y)
+        min_x = min(corrente_trasformata[0], min([x for x, y in trasformate]))
+        min_y = min(corrente_trasformata[1], min([y for x, y in trasformate]))
+        chiave = CodificaCasella((corrente_trasformata[0] - min_x, corrente_trasformata[1] - min_y)) + \
+                 "".join([CodificaCasella(casella) for casella in
+                          sorted([(x - min_x, y - min_y) for x, y in trasformate])])
+        if migliore is None or chiave < migliore[0]:
+            migliore = (chiave, simmetria)
+    return migliore
+
+# Trova tutte le sequenze di mosse che, partendo dalla
+# casella corrente, occupano tutte le caselle libere
+def Completa(corrente, libere):
+    libere = set(libere)
+    completamenti = []
+    mosse = []
+    def Esplora(corrente):
+        if not libere:
+            completamenti.append("".join(mosse))
+            return
+        for direzione, (d_x, d_y) in enumerate(SPOSTAMENTI):
+            percorse = []
+            x, y = corrente
+            while (x + d_x, y + d_y) in libere:
+                x, y = x + d_x, y + d_y
+                libere.remove((x, y))
+                percorse.append((x, y))
+            if percorse:
+                mosse.append(str(direzione))
+                Esplora(percorse[-1])
+                mosse.pop()
+                libere.update(percorse)
+    Esplora(corrente)
+    return completamenti
+
+# Genera la tabella delle regioni fino a dimensione caselle libere,
+# ritornando un dizionario dalla chiave normalizzata ai completamenti
+def Genera(dimensione = DIMENSIONE_FINALI):
+    completamenti = {}
+    # Le regioni utili sono quelle in cui le caselle libere e la
+    # corrente sono collegate: si generano tutte le forme collegate
+    # aggiungendo una casella alla volta
+    forme = set([((0, 0),)])
+    for caselle in range(2, dimensione + 2):
+        nuove_forme = set()
+        for forma in forme:
+            for x, y in forma:
+                for d_x, d_y in SPOSTAMENTI:
+                    contigua = (x + d_x, y + d_y)
+                    if contigua not in forma:
+                        nuova_forma = forma + (contigua,)
+                        min_x = min([x for x, y in nuova_forma])
+                        min_y = min([y for x, y in nuova_forma])
+                        nuove_forme.add(tuple(sorted([(x - min_x, y - min_y)
+                                                      for x, y in nuova_forma])))
+        forme = nuove_forme
+        for forma in forme:
+            for corrente in forma:
+                libere = [casella for casella in forma if casella != corrente]
+                chiave, simmetria = Normalizza(corrente, libere)
+                if simmetria != 0 or chiave in completamenti:
+                    continue
+                completamenti[chiave] = Completa(corrente, libere)
+    return dict([(chiave, mosse) for chiave, mosse in completamenti.items() if mosse])
+
+# Scrive la tabella compressa nel file
+def Salva(completamenti, dimensione, percorso = FILE_FINALI):
+    righe = ["%s %d" % (INTESTAZIONE, dimensione)]
+    for chiave in sorted(completamenti):
+        righe.append(" ".join([chiave] + completamenti[chiave]))
+    f = open(percorso, "wb")
+    try:
+        f.write(zlib.compress("\n".join(righe).encode("ascii"), 9))
+    finally:
+        f.close()
+
+# Classe che consulta la tabella dei finali. Al caricamento ogni
+# regione normalizzata viene ripetuta in tutti gli orientamenti, cosi`
+# che la ricerca di una regione richieda solo di traslarla e non di
+# provare tutte le simmetrie
+class Finali:
+    def __init__(self, dimensione, completamenti):
+        self.dimensione = dimensione
+        self.completamenti = completamenti
+        self.maschere = {}
+        self.regioni = {}
+        for chiave, mosse in completamenti.items():
+            caselle = DecodificaCaselle(chiave)
+            for (a, b, c, d), trasformate in zip(SIMMETRIE, DIREZIONI_TRASFORMATE):
+                caselle_trasformate = [(a * x + b * y, c * x + d * y) for x, y in caselle]
+                self.regioni[Traslata(caselle_trasformate[0], caselle_trasformate[1:])] = \
+                    sorted([tuple([trasformate[int(mossa)] for mossa in sequenza])
+                            for sequenza in mosse])
+
+    # Legge la tabella dal file
+    @staticmethod
+    def Carica(percorso = FILE_FINALI):
+        f = open(percorso, "rb")
+        try:
+            righe = zlib.decompress(f.read()).decode("ascii").split("\n")
+        finally:
+            f.close()
+        intestazione, dimensione = righe[0].split()
+        if intestazione != INTESTAZIONE:
+            raise Exception("file dei finali non valido %s" % percorso)
+        completamenti = {}
+        for riga in righe[1:]:
+            campi = riga.split()
+            completamenti[campi[0]] = campi[1:]
+        return Finali(int(dimensione), completamenti)
+
+    # Ritorna, nell'ordine in cui li troverebbe la ricerca, tutti i
+    # completamenti come tuple di direzioni (indici di DIREZIONI) a
+    # partire dalla casella corrente (x, y) con le caselle libere passate
+    def Completamenti(self, corrente, libere):
+        if len(libere) > self.dimensione:
+            raise Exception("regione di %d caselle troppo grande" % len(libere))
+        return self.regioni.get(Traslata(corrente, libere), [])
+
+    # Ritorna le regioni indicizzate come le cerca la ricerca di
+    # fullhouse_engine su una scacchiera della dimensione indicata: la
+    # regione e` la maschera con un bit ogni otto per casella (come
+    # int.from_bytes sulle caselle), spostata fino alla prima casella,
+    # con la colonna della prima casella e la distanza della casella
+    # corrente dalla prima. Senza la colonna due regioni diverse
+    # potrebbero dare la stessa maschera andando a capo in modo diverso
+    def Maschere(self, dimensione):
+        if dimensione not in self.maschere:
+            maschere = {}
+            for caselle, mosse in self.regioni.items():
+                larghezza = max([y for x, y in caselle]) + 1
+                if max([x for x, y in caselle]) >= dimensione or larghezza > dimensione:
+                    continue
+                for colonna in range(dimensione - larghezza + 1):
+                    indici = [x * dimensione + y + colonna for x, y in caselle]
+                    prima = min(indici)
+                    maschera = 0
+                    for indice in indici:
+                        maschera |= 1 << 8 * (indice - prima)
+                    maschere[(maschera, prima % dimensione, indici[0] - prima)] = mosse
+            self.maschere[dimensione] = maschere
+        return self.maschere[dimensione]
+
+# Tabella caricata al primo utilizzo
+finali = None
+
+# Ritorna la tabella dei finali caricandola la prima volta;
+# se il file non e` stato generato ritorna None
+def Tabella():
+    global finali
+    if finali is None and os.path.exists(FILE_FINALI):
+        finali = Finali.Carica()
+    return finali
+
+# Funzione di test
+def Test():
+    # Le regioni generate corrispondono ai completamenti
+    # trovati direttamente nell'orientamento originale
+    completamenti = Genera(4)
+    finali = Finali(4, completamenti)
+    for corrente, libere in (((0, 0), [(1, 0), (2, 0)]),
+                             ((2, 0), [(0, 0), (1, 0)]),
+                             ((1, 1), [(0, 0), (1, 0), (0, 1), (2, 1)]),
+                             ((0, 1), [(0, 0), (1, 0), (1, 1), (1, 2)]),
+                             ((0, 0), [(1, 1)])):
+        attesi = sorted([tuple([int(mossa) for mossa in mosse]) for mosse in Completa(corrente, libere)])
+        assert finali.Completamenti(corrente, libere) == attesi
+        chiave, simmetria = Normalizza(corrente, libere)
+        assert (chiave in completamenti) == (len(attesi) > 0)
+    assert Normalizza((0, 0), [(1, 0)])[0] == Normalizza((5, 3), [(5, 4)])[0]
+
+    # La tabella salvata e riletta e` identica
+    percorso = tempfile.mktemp()
+    try:
+        Salva(completamenti, 4, percorso)
+        riletta = Finali.Carica(percorso)
+        assert riletta.dimensione == 4
+        assert riletta.completamenti == completamenti
+        assert riletta.regioni == finali.regioni
+    finally:
+        if os.path.exists(percorso):
+            os.remove(percorso)
+
+    # La tabella distribuita ha la dimensione prevista
+    assert Tabella().dimensione == DIMENSIONE_FINALI
+
+# Se eseguito come script genera la tabella della dimensione
+# indicata oppure, senza argomenti, effettua solo il test
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        dimensione = int(sys.argv[1])
+        Salva(Genera(dimensione), dimensione)
+    else:
+        Test()
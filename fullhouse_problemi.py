@@ -9,156 +9,158 @@ Basato su un'idea di Erich Friedman <efriedma@stetson.edu>
 
 fullhouse_engine.py: motore del gioco
 fullhouse_problemi.py: lista dei problemi da risolvere
+fullhouse_finali.py: tabella dei finali
+fullhouse_censimento.py: censimento di tutte le scacchiere
 fullhouse.py: interfaccia grafica
 
 """
 
-from fullhouse_engine import Scacchiera, Posizione
+from fullhouse_engine import Problema, Posizione
 
 Problemi = (
-    Scacchiera(5, (Posizione(0, 3),
-                   Posizione(0, 4),
-                   Posizione(4, 4))),
-    Scacchiera(5, (Posizione(0, 2),
-                   Posizione(3, 3),
-                   Posizione(4, 1))),
-    Scacchiera(5, (Posizione(0, 4),
-                   Posizione(3, 2),
-                   Posizione(4, 0))),
-    Scacchiera(5, (Posizione(0, 0),
-                   Posizione(1, 0),
-                   Posizione(2, 3),
-                   Posizione(4, 2))),
-    Scacchiera(5, (Posizione(0, 0),
-                   Posizione(2, 1),
-                   Posizione(3, 4),
-                   Posizione(4, 2))),
-    Scacchiera(5, (Posizione(0, 0),
-                   Posizione(0, 1),
-                   Posizione(0, 2),
-                   Posizione(4, 3),
-                   Posizione(4, 4))),
+    Problema(5, (Posizione(0, 3),
+                 Posizione(0, 4),
+                 Posizione(4, 4))),
+    Problema(5, (Posizione(0, 2),
+                 Posizione(3, 3),
+                 Posizione(4, 1))),
+    Problema(5, (Posizione(0, 4),
+                 Posizione(3, 2),
+                 Posizione(4, 0))),
+    Problema(5, (Posizione(0, 0),
+                 Posizione(1, 0),
+                 Posizione(2, 3),
+                 Posizione(4, 2))),
+    Problema(5, (Posizione(0, 0),
+                 Posizione(2, 1),
+                 Posizione(3, 4),
+                 Posizione(4, 2))),
+    Problema(5, (Posizione(0, 0),
+                 Posizione(0, 1),
+                 Posizione(0, 2),
+                 Posizione(4, 3),
+                 Posizione(4, 4))),
 
-    Scacchiera(6, (Posizione(0, 3),
-                   Posizione(1, 3),
-                   Posizione(4, 1))),
-    Scacchiera(6, (Posizione(0, 0),
-                   Posizione(1, 2),
-                   Posizione(0, 4),
-                   Posizione(0, 5),
-                   Posizione(3, 5))),
-    Scacchiera(6, (Posizione(0, 0),
-                   Posizione(2, 1),
-                   Posizione(1, 4),
-                   Posizione(5, 4),
-                   Posizione(5, 5))),
-    Scacchiera(6, (Posizione(0, 2),
-                   Posizione(1, 4),
-                   Posizione(3, 0),
-                   Posizione(3, 1),
-                   Posizione(5, 2))),
-    Scacchiera(6, (Posizione(0, 2),
-                   Posizione(1, 4),
-                   Posizione(3, 1),
-                   Posizione(4, 1))),
-    Scacchiera(6, (Posizione(1, 1),
-                   Posizione(4, 3),
-                   Posizione(5, 0),
-                   Posizione(5, 3))),
-    Scacchiera(6, (Posizione(0, 0),
-                   Posizione(0, 5),
-                   Posizione(2, 1),
-                   Posizione(3, 3))),
-    Scacchiera(6, (Posizione(0, 0),
-                   Posizione(0, 5),
-                   Posizione(1, 2),
-                   Posizione(4, 4),
-                   Posizione(5, 2))),
-    Scacchiera(6, (Posizione(1, 1),
-                   Posizione(2, 1),
-                   Posizione(2, 5),
-                   Posizione(4, 2),
-                   Posizione(4, 3),
-                   Posizione(5, 5))),
+    Problema(6, (Posizione(0, 3),
+                 Posizione(1, 3),
+                 Posizione(4, 1))),
+    Problema(6, (Posizione(0, 0),
+                 Posizione(1, 2),
+                 Posizione(0, 4),
+                 Posizione(0, 5),
+                 Posizione(3, 5))),
+    Problema(6, (Posizione(0, 0),
+                 Posizione(2, 1),
+                 Posizione(1, 4),
+                 Posizione(5, 4),
+                 Posizione(5, 5))),
+    Problema(6, (Posizione(0, 2),
+                 Posizione(1, 4),
+                 Posizione(3, 0),
+                 Posizione(3, 1),
+                 Posizione(5, 2))),
+    Problema(6, (Posizione(0, 2),
+                 Posizione(1, 4),
+                 Posizione(3, 1),
+                 Posizione(4, 1))),
+    Problema(6, (Posizione(1, 1),
+                 Posizione(4, 3),
+                 Posizione(5, 0),
+                 Posizione(5, 3))),
+    Problema(6, (Posizione(0, 0),
+                 Posizione(0, 5),
+                 Posizione(2, 1),
+                 Posizione(3, 3))),
+    Problema(6, (Posizione(0, 0),
+                 Posizione(0, 5),
+                 Posizione(1, 2),
+                 Posizione(4, 4),
+                 Posizione(5, 2))),
+    Problema(6, (Posizione(1, 1),
+                 Posizione(2, 1),
+                 Posizione(2, 5),
+                 Posizione(4, 2),
+                 Posizione(4, 3),
+                 Posizione(5, 5))),
 
-    Scacchiera(7, (Posizione(0, 0),
-                   Posizione(1, 2),
-                   Posizione(2, 4),
-                   Posizione(3, 2),
-                   Posizione(4, 2),
-                   Posizione(6, 4))),
-    Scacchiera(7, (Posizione(0, 6),
-                   Posizione(1, 3),
-                   Posizione(1, 4),
-                   Posizione(3, 4),
-                   Posizione(4, 2),
-                   Posizione(5, 4))),
-    Scacchiera(7, (Posizione(0, 6),
-                   Posizione(1, 4),
-                   Posizione(2, 1),
-                   Posizione(2, 2),
-                   Posizione(4, 2))),
-    Scacchiera(7, (Posizione(0, 4),
-                   Posizione(1, 2),
-                   Posizione(5, 1),
-                   Posizione(5, 6),
-                   Posizione(6, 6))),
-    Scacchiera(7, (Posizione(1, 4),
-                   Posizione(1, 5),
-                   Posizione(3, 6),
-                   Posizione(4, 2),
-                   Posizione(5, 5))),
-    Scacchiera(7, (Posizione(1, 2),
-                   Posizione(3, 1),
-                   Posizione(5, 4),
-                   Posizione(6, 6))),
-    Scacchiera(7, (Posizione(2, 2),
-                   Posizione(2, 4),
-                   Posizione(3, 2),
-                   Posizione(4, 5),
-                   Posizione(5, 1))),
-    Scacchiera(7, (Posizione(0, 0),
-                   Posizione(0, 1),
-                   Posizione(1, 3),
-                   Posizione(2, 5),
-                   Posizione(3, 3))),
-    Scacchiera(7, (Posizione(3, 1),
-                   Posizione(4, 4),
-                   Posizione(4, 5),
-                   Posizione(5, 4),
-                   Posizione(6, 6))),
+    Problema(7, (Posizione(0, 0),
+                 Posizione(1, 2),
+                 Posizione(2, 4),
+                 Posizione(3, 2),
+                 Posizione(4, 2),
+                 Posizione(6, 4))),
+    Problema(7, (Posizione(0, 6),
+                 Posizione(1, 3),
+                 Posizione(1, 4),
+                 Posizione(3, 4),
+                 Posizione(4, 2),
+                 Posizione(5, 4))),
+    Problema(7, (Posizione(0, 6),
+                 Posizione(1, 4),
+                 Posizione(2, 1),
+                 Posizione(2, 2),
+                 Posizione(4, 2))),
+    Problema(7, (Posizione(0, 4),
+                 Posizione(1, 2),
+                 Posizione(5, 1),
+                 Posizione(5, 6),
+                 Posizione(6, 6))),
+    Problema(7, (Posizione(1, 4),
+                 Posizione(1, 5),
+                 Posizione(3, 6),
+                 Posizione(4, 2),
+                 Posizione(5, 5))),
+    Problema(7, (Posizione(1, 2),
+                 Posizione(3, 1),
+                 Posizione(5, 4),
+                 Posizione(6, 6))),
+    Problema(7, (Posizione(2, 2),
+                 Posizione(2, 4),
+                 Posizione(3, 2),
+                 Posizione(4, 5),
+                 Posizione(5, 1))),
+    Problema(7, (Posizione(0, 0),
+                 Posizione(0, 1),
+                 Posizione(1, 3),
+                 Posizione(2, 5),
+                 Posizione(3, 3))),
+    Problema(7, (Posizione(3, 1),
+                 Posizione(4, 4),
+                 Posizione(4, 5),
+                 Posizione(5, 4),
+                 Posizione(6, 6))),
 
-    Scacchiera(8, (Posizione(0, 7),
-                   Posizione(2, 6),
-                   Posizione(3, 1),
-                   Posizione(5, 2),
-                   Posizione(5, 3))),
-    Scacchiera(8, (Posizione(0, 0),
-                   Posizione(1, 6),
-                   Posizione(2, 1),
-                   Posizione(3, 7),
-                   Posizione(4, 5))),
-    Scacchiera(8, (Posizione(0, 2),
-                   Posizione(1, 4),
-                   Posizione(3, 0),
-                   Posizione(4, 0),
-                   Posizione(5, 2))),
+    Problema(8, (Posizione(0, 7),
+                 Posizione(2, 6),
+                 Posizione(3, 1),
+                 Posizione(5, 2),
+                 Posizione(5, 3))),
+    Problema(8, (Posizione(0, 0),
+                 Posizione(1, 6),
+                 Posizione(2, 1),
+                 Posizione(3, 7),
+                 Posizione(4, 5))),
+    Problema(8, (Posizione(0, 2),
+                 Posizione(1, 4),
+                 Posizione(3, 0),
+                 Posizione(4, 0),
+                 Posizione(5, 2))),
 
-    Scacchiera(9, (Posizione(1, 3),
-                   Posizione(2, 5),
-                   Posizione(5, 0),
-                   Posizione(6, 6),
-                   Posizione(7, 1))),
-    Scacchiera(9, (Posizione(4, 1),
-                   Posizione(4, 2),
-                   Posizione(4, 3),
-                   Posizione(6, 2),
-                   Posizione(7, 4),
-                   Posizione(8, 6))),
-    Scacchiera(9, (Posizione(1, 1),
-                   Posizione(1, 2),
-                   Posizione(4, 4),
-                   Posizione(6, 2),
-                   Posizione(7, 4),
-                   Posizione(7, 5))),
+    Problema(9, (Posizione(1, 3),
+                 Posizione(2, 5),
+                 Posizione(5, 0),
+                 Posizione(6, 6),
+                 Posizione(7, 1))),
+    Problema(9, (Posizione(4, 1),
+                 Posizione(4, 2),
+                 Posizione(4, 3),
+                 Posizione(6, 2),
+                 Posizione(7, 4),
+                 Posizione(8, 6))),
+    Problema(9, (Posizione(1, 1),
+                 Posizione(1, 2),
+                 Posizione(4, 4),
+                 Posizione(6, 2),
+                 Posizione(7, 4),
+                 Posizione(7, 5))),
     )